@@ -1,54 +1,159 @@
 #!/usr/bin/env python3
 """Remove console.log statements from TypeScript files."""
 
+import bisect
+import mmap
+import os
 import re
+import shutil
 import sys
+import tempfile
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Locates candidate statement starts; the parenthesis balancing is done by
+# walking forward from each match. Bytes patterns so we can scan an mmap'd
+# file without decoding it -- in UTF-8 every byte of a multi-byte character
+# is >= 0x80, so the ASCII syntax bytes below never false-match.
+CONSOLE_LOG_RE = re.compile(rb"console\.log\s*\(")
+
+# String literals and comments, whose parentheses must not count toward the
+# balance (and whose console.log text is not a statement)
+STRING_OR_COMMENT_RE = re.compile(
+    rb"//[^\n]*"
+    rb"|/\*.*?\*/"
+    rb"|'(?:\\.|[^'\\\n])*'"
+    rb"|\"(?:\\.|[^\"\\\n])*\""
+    rb"|`(?:\\.|[^`\\])*`",
+    re.S,
+)
+
+
+def literal_spans(content):
+    """Return the (start, end) spans of string literals and comments."""
+    return [match.span() for match in STRING_OR_COMMENT_RE.finditer(content)]
+
+
+def span_containing(spans, pos):
+    """Return the span from the sorted spans list containing pos, or None."""
+    i = bisect.bisect_right(spans, (pos, sys.maxsize)) - 1
+    if i >= 0 and spans[i][0] <= pos < spans[i][1]:
+        return spans[i]
+    return None
+
+
+def scan_source(content, spans):
+    """Compute per-byte paren-depth prefix sums.
+
+    prefix[i] is the parenthesis depth after byte i, counted as a single
+    numpy cumsum over the whole file with parens inside the given
+    string/comment spans zeroed out.
+    """
+    chars = np.frombuffer(content, dtype=np.uint8)
+    delta = (chars == ord("(")).astype(np.int8) - (chars == ord(")")).astype(np.int8)
+
+    for start, end in spans:
+        delta[start:end] = 0
+
+    return np.cumsum(delta)
+
+
+def balanced_end_from_prefix(prefix, open_pos):
+    """Return the index just past the ')' matching the '(' at open_pos."""
+    tail = prefix[open_pos:]
+    rel = int(np.argmax(tail == prefix[open_pos] - 1))
+    if tail[rel] != prefix[open_pos] - 1:
+        return None
+    return open_pos + rel + 1
+
+
+def find_balanced_end(content, open_pos, spans):
+    """Return the index just past the ')' matching the '(' at open_pos.
+
+    Jumps between parentheses with bytes.find (memchr in C) instead of
+    visiting every byte in Python; parentheses inside the given
+    string/comment spans are skipped, matching the numpy path.
+    """
+    depth = 1
+    pos = open_pos + 1
+    while depth:
+        next_close = content.find(b")", pos)
+        if next_close == -1:
+            return None
+        next_open = content.find(b"(", pos, next_close)
+        candidate = next_open if next_open != -1 else next_close
+
+        literal = span_containing(spans, candidate)
+        if literal is not None:
+            # Parenthesis inside a string or comment; resume after it
+            pos = literal[1]
+            continue
+
+        if candidate == next_open:
+            depth += 1
+        else:
+            depth -= 1
+        pos = candidate + 1
+    return pos
 
 
-def remove_console_logs(content):
-    """Remove all console.log statements, handling multi-line cases."""
+def console_log_spans(content):
+    """Return the (start, end) byte spans of content worth keeping.
+
+    content is any bytes-like object (bytes, mmap, memoryview); the spans
+    are everything except whole-line console.log statements.
+    """
+
+    # Collect (start, end) spans of content to keep -- no per-line list and
+    # no per-character Python scan of the file
+    keeps = []
+    cursor = 0
+
+    spans = literal_spans(content)
+    prefix = scan_source(content, spans) if HAS_NUMPY else None
+
+    for match in CONSOLE_LOG_RE.finditer(content):
+        start = match.start()
+        if start < cursor:
+            # Inside a statement that is already being removed
+            continue
+
+        if span_containing(spans, start) is not None:
+            # console.log text inside a string or comment
+            continue
+
+        # Only remove statements that start their own line
+        line_start = content.rfind(b"\n", 0, start) + 1
+        if content[line_start:start].strip():
+            continue
 
-    # Pattern to match console.log with proper parenthesis balancing
-    # This handles both single-line and multi-line console.log statements
-    result = []
-    lines = content.split("\n")
-    i = 0
-
-    while i < len(lines):
-        line = lines[i]
-
-        # Check if this line starts a console.log statement
-        stripped = line.lstrip()
-        if stripped.startswith("console.log("):
-            # Find the matching closing parenthesis
-            indent = line[: len(line) - len(stripped)]
-            paren_count = 0
-            in_console_log = False
-            j = i
-
-            while j < len(lines):
-                current_line = lines[j]
-                for char in current_line:
-                    if char == "(":
-                        paren_count += 1
-                        in_console_log = True
-                    elif char == ")":
-                        paren_count -= 1
-                        if in_console_log and paren_count == 0:
-                            # Found the end of console.log
-                            # Skip all lines from i to j inclusive
-                            i = j + 1
-                            break
-                else:
-                    # Didn't break, continue to next line
-                    j += 1
-                    continue
-                break
+        if prefix is not None:
+            end = balanced_end_from_prefix(prefix, match.end() - 1)
         else:
-            result.append(line)
-            i += 1
+            end = find_balanced_end(content, match.end() - 1, spans)
+        if end is None:
+            # Unbalanced parentheses; leave the rest untouched
+            break
 
-    return "\n".join(result)
+        # Drop the statement's whole line(s), trailing newline included
+        line_end = content.find(b"\n", end)
+        line_end = len(content) if line_end == -1 else line_end + 1
+
+        keeps.append((cursor, line_start))
+        cursor = line_end
+
+    keeps.append((cursor, len(content)))
+    return keeps
+
+
+def remove_console_logs(content):
+    """Remove all console.log statements, handling multi-line cases."""
+    return b"".join(content[s:e] for s, e in console_log_spans(content))
 
 
 def main():
@@ -58,13 +163,28 @@ def main():
 
     filepath = sys.argv[1]
 
-    with open(filepath, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    modified_content = remove_console_logs(content)
-
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(modified_content)
+    # Scan the file in place via mmap (no decode, no whole-file str) and
+    # stream only the kept spans to a temp file swapped in atomically
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            print(f"Removed console.log statements from {filepath}")
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            keeps = console_log_spans(mm)
+
+            view = memoryview(mm)
+            try:
+                with tempfile.NamedTemporaryFile(
+                    dir=os.path.dirname(os.path.abspath(filepath)), delete=False
+                ) as out:
+                    for s, e in keeps:
+                        out.write(view[s:e])
+            finally:
+                view.release()
+
+    shutil.copymode(filepath, out.name)
+    os.replace(out.name, filepath)
 
     print(f"Removed console.log statements from {filepath}")
 